@@ -7,12 +7,12 @@ It allows users to:
 2. Map columns between the files
 3. Append data from source to target based on the mappings
 
-The application uses PyQt6 for the GUI components and pandas for Excel data handling.
+The application uses PyQt6 for the GUI components, python-calamine for reading Excel data
+and xlsxwriter for writing it.
 """
 
 import sys
-from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QLabel, QFileDialog, QMessageBox
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QLabel, QFileDialog, QMessageBox, QCheckBox
 from mapping_review_dialog import MappingReviewDialog
 from data_appender import append_data
 
@@ -64,10 +64,18 @@ class MainWindow(QMainWindow):
         #----------------------------------------------------
         # Action Button Section
         #----------------------------------------------------
+        action_layout = QHBoxLayout()
+        action_layout.addStretch()
         append_button = QPushButton("Append Data")
         # Connect the button click event to the append_data method
         append_button.clicked.connect(self.append_data)
-        layout.addWidget(append_button, alignment=Qt.AlignmentFlag.AlignCenter)
+        action_layout.addWidget(append_button)
+        # When checked, the combined data is written to a .parquet file beside the target
+        # and the target Excel file is left unchanged
+        self.parquet_checkbox = QCheckBox("Save as Parquet")
+        action_layout.addWidget(self.parquet_checkbox)
+        action_layout.addStretch()
+        layout.addLayout(action_layout)
 
     def browse_file(self, input_field, dialog_title):
         """
@@ -77,7 +85,7 @@ class MainWindow(QMainWindow):
             input_field: The QLineEdit to update with the selected file path
             dialog_title: Title for the file dialog window
         """
-        file_name, _ = QFileDialog.getOpenFileName(self, dialog_title, "", "Excel Files (*.xlsx *.xls)")
+        file_name, _ = QFileDialog.getOpenFileName(self, dialog_title, "", "Excel Files (*.xlsx)")
         if file_name:
             input_field.setText(file_name)
 
@@ -103,14 +111,16 @@ class MainWindow(QMainWindow):
             manual_mappings = mapping_dialog.get_manual_mappings()
             try:
                 # Perform the actual data append operation
-                stats = append_data(source_file, target_file, manual_mappings)
+                output_format = "parquet" if self.parquet_checkbox.isChecked() else "xlsx"
+                stats = append_data(source_file, target_file, manual_mappings, output_format)
                 # Display success message with operation statistics
                 QMessageBox.information(self, "Operation Successful", 
                     f"Data appended successfully!\n\n"
                     f"Source columns: {stats['source_columns']}\n"
                     f"Target columns: {stats['target_columns']}\n"
                     f"Mapped columns: {stats['mapped_columns']}\n"
-                    f"Appended rows: {stats['appended_rows']}"
+                    f"Appended rows: {stats['appended_rows']}\n"
+                    f"Saved to: {stats['output_file']}"
                 )
             except Exception as e:
                 # Display error message if operation fails
@@ -5,15 +5,28 @@ This module provides functionality to append data from a source Excel file
 to a target Excel file based on user-defined column mappings.
 
 The main function takes care of:
-1. Reading data from both files
+1. Reading rows from both files with the Rust-based calamine parser
 2. Applying column mappings to align data structure
-3. Appending mapped data to the target file
+3. Writing the target rows followed by the mapped source rows to a new file
+   (either a replacement .xlsx or a Parquet file alongside the target)
 4. Generating statistics about the operation
 """
 
-import pandas as pd
+import contextlib
+import datetime
+import os
+import shutil
+import tempfile
+from operator import itemgetter
 
-def append_data(source_file, target_file, manual_mappings):
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xlsxwriter
+from python_calamine import CalamineWorkbook
+
+from header_reader import read_headers
+
+def append_data(source_file, target_file, manual_mappings, output_format="xlsx"):
     """
     Append data from source Excel file to target Excel file using specified column mappings.
     
@@ -21,42 +34,264 @@ def append_data(source_file, target_file, manual_mappings):
         source_file (str): Path to the source Excel file
         target_file (str): Path to the target Excel file
         manual_mappings (dict): Dictionary of {target_column: source_column} mappings
+        output_format (str): "xlsx" to overwrite the target file, or "parquet" to leave it
+            untouched and write the combined data to a .parquet file beside it
     
     Returns:
         dict: Statistics about the operation including column and row counts
+              and the path of the file written
     
     Raises:
         Various exceptions if file access or data processing fails
     """
-    # Step 1: Read both Excel files into pandas DataFrames
-    source_df = pd.read_excel(source_file)
-    target_df = pd.read_excel(target_file)
+    if output_format not in ("xlsx", "parquet"):
+        raise ValueError(f"Unsupported output format: {output_format}")
+    # The writer produces a plain .xlsx package, which Excel rejects under any other extension
+    if output_format == "xlsx" and os.path.splitext(target_file)[1].lower() != ".xlsx":
+        raise ValueError("The target file must be an .xlsx workbook to be overwritten")
+
+    # Step 1: Look up both header rows (usually already cached by the mapping dialog)
+    source_columns = read_headers(source_file)
+    target_columns = read_headers(target_file)
+
+    # Step 2: Work out, once, which source column feeds each target column.
+    # Only source columns up to the last mapped one are read; unmapped target
+    # columns point just past them, where a None pad is appended, so each row
+    # is permuted by a single itemgetter call.
+    # The result is in target column order, so the output keeps the target layout.
+    source_positions = {}
+    for index, source_col in enumerate(source_columns):
+        source_positions.setdefault(source_col, index)  # First match wins, like list.index
+    mapped_positions = [
+        source_positions.get(manual_mappings.get(target_col))
+        for target_col in target_columns
+    ]
+    source_width = max((index for index in mapped_positions if index is not None), default=-1) + 1
+    col_index_map = [source_width if index is None else index for index in mapped_positions]
+    mapped_columns = len(mapped_positions) - mapped_positions.count(None)
+    permute = _row_permuter(col_index_map)
+    pad = (None,)
+
+    # Step 3: Read the target rows and lazily map the source rows
+    if output_format == "parquet":
+        output_file = os.path.splitext(target_file)[0] + ".parquet"
+        target_title, target_rows = _read_sheet_rows(target_file, width=len(target_columns))
+    else:
+        output_file = target_file
+        target_title, target_rows = _read_sheet_rows(target_file)
+    _, source_rows = _read_sheet_rows(source_file, width=source_width)
+    next(source_rows, None)  # Skip the header row
+    # Skip rows with nothing in the mapped columns, as they would append a blank row
+    mapped_rows = (row for row in map(permute, (row + pad for row in source_rows))
+                   if row.count(None) != len(row))
+
+    # Step 4: Write the combined rows next to the output file, then swap it in
+    # so a failed write leaves any existing file intact
+    if output_format == "parquet":
+        next(target_rows, None)  # Column names come from target_columns instead
+        appended_rows = _write_parquet(output_file, target_columns, target_rows, mapped_rows)
+    else:
+        appended_rows = _write_xlsx(output_file, target_title, target_rows, mapped_rows)
 
-    # Step 2: Create a copy of source data to apply mappings
-    mapped_source_df = source_df.copy()
+    # Step 5: Return statistics about the operation
+    return {
+        "source_columns": len(source_columns),
+        "target_columns": len(target_columns),
+        "mapped_columns": mapped_columns,
+        "appended_rows": appended_rows,
+        "output_file": output_file
+    }
+
+def _write_xlsx(path, title, target_rows, mapped_rows):
+    """
+    Stream the target rows followed by the mapped source rows into a new .xlsx.
     
-    # Apply column mappings by renaming source columns to match target columns
-    for target_col, source_col in manual_mappings.items():
-        if source_col in mapped_source_df.columns:
-            mapped_source_df = mapped_source_df.rename(columns={source_col: target_col})
+    xlsxwriter's constant_memory mode flushes each row to disk as soon as the
+    next one starts, so memory use does not grow with the number of rows.
+    Strings are written as-is rather than being turned into formulas or links.
+    
+    Returns:
+        int: Number of mapped source rows written
+    """
+    with _atomic_output(path, ".xlsx") as temp_file:
+        out_wb = xlsxwriter.Workbook(temp_file, {
+            "constant_memory": True,
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+            "default_date_format": "yyyy-mm-dd",
+        })
+        out_ws = out_wb.add_worksheet(title)
+        # Dates use default_date_format; keep the time part visible for the other types
+        # and show durations as elapsed hours rather than as a 1900 date
+        datetime_format = out_wb.add_format({"num_format": "yyyy-mm-dd h:mm:ss"})
+        time_format = out_wb.add_format({"num_format": "h:mm:ss"})
+        duration_format = out_wb.add_format({"num_format": "[h]:mm:ss"})
+        out_ws.add_write_handler(datetime.datetime, lambda ws, row, col, value, cell_format=None:
+                                 ws.write_datetime(row, col, value, datetime_format))
+        out_ws.add_write_handler(datetime.time, lambda ws, row, col, value, cell_format=None:
+                                 ws.write_datetime(row, col, value, time_format))
+        out_ws.add_write_handler(datetime.timedelta, lambda ws, row, col, value, cell_format=None:
+                                 ws.write_datetime(row, col, value, duration_format))
 
-    # Step 3: Find columns that exist in both dataframes after mapping
-    common_columns = list(set(mapped_source_df.columns) & set(target_df.columns))
+        write_row = out_ws.write_row
+        row_index = 0
+        for row in target_rows:
+            write_row(row_index, 0, row)
+            row_index += 1
 
-    # Step 4: Clean data - Fill NaN values with empty strings to avoid errors
-    for col in common_columns:
-        mapped_source_df[col] = mapped_source_df[col].fillna('') 
+        # xlsxwriter silently ignores rows past Excel's sheet limit, so stop before
+        # losing data; raising here leaves the target file unchanged
+        max_rows = out_ws.xls_rowmax
+        appended_rows = 0
+        for row in mapped_rows:
+            if row_index >= max_rows:
+                out_wb.close()
+                raise ValueError(f"The combined data exceeds Excel's limit of {max_rows:,} rows per sheet")
+            write_row(row_index, 0, row)
+            row_index += 1
+            appended_rows += 1
+        out_wb.close()
+    return appended_rows
 
-    # Step 5: Append data - only using columns that exist in the target file
-    appended_df = pd.concat([target_df, mapped_source_df[common_columns]], ignore_index=True)
+def _write_parquet(path, column_names, target_rows, mapped_rows):
+    """
+    Write the target rows followed by the mapped source rows as a zstd-compressed Parquet file.
+    
+    Duplicate column names are made unique as pandas does ("A", "A.1", ...),
+    since Parquet readers reject ambiguous field names.
+    Columns whose values have mixed types (e.g. numbers and text) cannot be
+    stored as a single Arrow type, so they are written as text instead.
+    calamine returns midnight datetimes as dates, so a column mixing dates and
+    datetimes is stored as timestamps to keep the time part.
+    
+    Returns:
+        int: Number of mapped source rows written
+    """
+    rows = list(target_rows)
+    existing_rows = len(rows)
+    rows.extend(mapped_rows)
 
-    # Step 6: Save the combined data back to the target file
-    appended_df.to_excel(target_file, index=False)
+    columns = list(zip(*rows)) if rows else [()] * len(column_names)
+    arrays = []
+    for values in columns:
+        value_types = set(map(type, values))
+        if datetime.date in value_types and datetime.datetime in value_types:
+            values = [datetime.datetime.combine(v, datetime.time()) if type(v) is datetime.date else v
+                      for v in values]
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array([None if v is None else str(v) for v in values], type=pa.string()))
+    table = pa.Table.from_arrays(arrays, names=_unique_names(column_names))
 
-    # Step 7: Return statistics about the operation
-    return {
-        "source_columns": len(source_df.columns),
-        "target_columns": len(target_df.columns),
-        "mapped_columns": len(common_columns),
-        "appended_rows": len(mapped_source_df)
-    }
\ No newline at end of file
+    with _atomic_output(path, ".parquet") as temp_file:
+        pq.write_table(table, temp_file, compression="zstd")
+    return len(rows) - existing_rows
+
+def _unique_names(names):
+    """
+    Rename repeated names to "name.1", "name.2", ..., following pandas' rules.
+    
+    Args:
+        names: Column names, possibly with duplicates
+    
+    Returns:
+        list: Column names with every entry unique
+    """
+    counts = {}
+    unique = []
+    for name in names:
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts.get(name, 0)
+        unique.append(name)
+        counts[name] = count + 1
+    return unique
+
+@contextlib.contextmanager
+def _atomic_output(path, suffix):
+    """
+    Provide a temporary file beside path to write to, then move it over path.
+    
+    If the body raises, the temporary file is removed and path is left untouched.
+    mkstemp creates files readable only by their owner, so the temporary file
+    takes the permissions of the file it replaces (or the umask default for a
+    new file) before being moved into place.
+    
+    Args:
+        path (str): Final location of the file
+        suffix (str): Extension for the temporary file
+    """
+    fd, temp_file = tempfile.mkstemp(suffix=suffix, dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+    try:
+        yield temp_file
+        if os.path.exists(path):
+            shutil.copymode(path, temp_file)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_file, 0o666 & ~umask)
+        os.replace(temp_file, path)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+
+def _read_sheet_rows(path, width=None):
+    """
+    Parse the first sheet of an Excel file with calamine.
+    
+    calamine trims leading empty rows and columns and returns "" for empty
+    cells, so rows are shifted back to start at cell A1 and "" becomes None,
+    matching what openpyxl would have returned.
+    
+    Args:
+        path (str): Path to the Excel file
+        width (int): If given, every row is padded or truncated to this many values,
+            so columns beyond it are never converted
+    
+    Returns:
+        tuple: (sheet title, iterator of row tuples starting from row 1)
+    """
+    workbook = CalamineWorkbook.from_path(path)
+    sheet = workbook.get_sheet_by_index(0)
+    return workbook.sheet_names[0], _iter_sheet_rows(sheet, width)
+
+def _iter_sheet_rows(sheet, width):
+    """Yield the rows of a calamine sheet as tuples aligned to column A."""
+    if sheet.start is None:
+        return
+    first_row, first_col = sheet.start
+    row_width = first_col + sheet.width
+    if width is None:
+        width = row_width
+    lead = (None,) * min(first_col, width)
+    tail = (None,) * max(width - row_width, 0)
+    # Cut unwanted columns off the raw row before any per-cell work
+    keep = max(width - first_col, 0) if width < row_width else None
+    blank = (None,) * width
+
+    for _ in range(first_row):
+        yield blank
+    for row in sheet.iter_rows():
+        if keep is not None:
+            row = row[:keep]
+        if "" in row:
+            row = [None if value == "" else value for value in row]
+        yield lead + tuple(row) + tail
+
+def _row_permuter(col_index_map):
+    """
+    Build a function that picks the values at col_index_map out of a row, as a tuple.
+    
+    itemgetter returns a bare value for a single index and cannot be built
+    with none, so those cases are wrapped to always return a tuple.
+    """
+    if len(col_index_map) == 1:
+        index = col_index_map[0]
+        return lambda row: (row[index],)
+    if not col_index_map:
+        return lambda row: ()
+    return itemgetter(*col_index_map)
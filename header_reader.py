@@ -0,0 +1,169 @@
+"""
+Header Reader Module
+
+This module reads the header row (column names) of an Excel file.
+
+Rather than loading the workbook, the .xlsx file is opened as a zip archive and
+only the XML needed for the first row is parsed:
+1. The workbook and its relationships, to locate the first sheet
+2. The first sheet, up to the end of its first row
+3. The shared strings, up to the last one referenced by that row
+
+Headers are needed both when reviewing mappings and when appending data, so
+results are cached per file. A cached entry is reused only while the file's
+modification time and size are unchanged.
+"""
+
+import functools
+import os
+import posixpath
+import xml.etree.ElementTree as ET
+import zipfile
+
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+def read_headers(path):
+    """
+    Return the column names from the first row of the first sheet of an Excel file.
+    
+    Empty header cells are named "Unnamed: <index>", matching pandas.
+    
+    Args:
+        path (str): Path to the Excel file
+    
+    Returns:
+        list: Column names as strings, in sheet order
+    """
+    stat = os.stat(path)
+    return list(_read_headers_cached(os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+
+@functools.lru_cache(maxsize=16)
+def _read_headers_cached(path, mtime_ns, size):
+    """
+    Parse the header row of an Excel file.
+    
+    The modification time and size are only part of the cache key, so that an
+    edited file is parsed again instead of served from the cache.
+    """
+    header = _fast_headers(path)
+    return tuple(
+        f"Unnamed: {index}" if value is None else value
+        for index, value in enumerate(header)
+    )
+
+def _fast_headers(path):
+    """
+    Read the raw first-row values of the first sheet straight from the .xlsx XML.
+    
+    Returns:
+        list: Cell text in column order, with None for empty cells
+    """
+    with zipfile.ZipFile(path) as archive:
+        sheet_path, shared_strings_path = _locate_parts(archive)
+
+        # Collect (column, type, text) for each cell of row 1
+        cells = []
+        with archive.open(sheet_path) as sheet:
+            for _, element in ET.iterparse(sheet, events=("end",)):
+                tag = _local_name(element.tag)
+                if tag == "c":
+                    cells.append((element.get("r"), element.get("t"), _cell_text(element)))
+                elif tag == "row":
+                    if element.get("r", "1") != "1":
+                        cells = []  # Row 1 is empty, so there are no headers
+                    break
+                if tag not in ("v", "t", "r", "is"):
+                    element.clear()
+
+        # Resolve shared string references, reading only as far as needed
+        needed = [int(text) for _, cell_type, text in cells if cell_type == "s" and text is not None]
+        shared_strings = _read_shared_strings(archive, shared_strings_path, max(needed, default=-1))
+
+    header = []
+    for ref, cell_type, text in cells:
+        column = _column_index(ref) if ref else len(header)
+        header.extend([None] * (column - len(header)))
+        if text is None:
+            value = None
+        elif cell_type == "s":
+            value = shared_strings[int(text)]
+        elif cell_type == "b":
+            value = str(text == "1")
+        elif cell_type in ("str", "inlineStr", "e", "d"):
+            value = text
+        else:
+            value = _number_text(text)
+        header.append(value)
+    return header
+
+def _locate_parts(archive):
+    """Return the zip paths of the first worksheet and of the shared strings part (or None)."""
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    first_sheet = next(el for el in workbook.iter() if _local_name(el.tag) == "sheet")
+    sheet_rel_id = first_sheet.get(REL_NS + "id")
+
+    rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    sheet_path = shared_strings_path = None
+    for rel in rels:
+        target = rel.get("Target", "")
+        target = target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+        if rel.get("Id") == sheet_rel_id:
+            sheet_path = target
+        elif rel.get("Type", "").endswith("/sharedStrings"):
+            shared_strings_path = target
+    return sheet_path, shared_strings_path
+
+def _read_shared_strings(archive, shared_strings_path, last_index):
+    """Return the shared strings table up to and including last_index."""
+    strings = []
+    if last_index < 0 or shared_strings_path is None:
+        return strings
+    with archive.open(shared_strings_path) as part:
+        for _, element in ET.iterparse(part, events=("end",)):
+            if _local_name(element.tag) == "si":
+                strings.append(_rich_text(element))
+                element.clear()
+                if len(strings) > last_index:
+                    break
+    return strings
+
+def _cell_text(cell):
+    """Return the stored text of a <c> element, from <v> or an inline <is> string."""
+    for child in cell:
+        tag = _local_name(child.tag)
+        if tag == "v":
+            return child.text or ""
+        if tag == "is":
+            return _rich_text(child)
+    return None
+
+def _rich_text(element):
+    """Join the <t> runs of a string item, ignoring phonetic hints."""
+    parts = []
+    for child in element:
+        tag = _local_name(child.tag)
+        if tag == "t":
+            parts.append(child.text or "")
+        elif tag == "r":
+            parts.extend(t.text or "" for t in child if _local_name(t.tag) == "t")
+    return "".join(parts)
+
+def _number_text(text):
+    """Format a numeric cell the way openpyxl would read it (integers stay integers)."""
+    try:
+        return str(int(text))
+    except ValueError:
+        return str(float(text))
+
+def _column_index(ref):
+    """Convert a cell reference such as "AB1" to a zero-based column index."""
+    index = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - 64
+    return index - 1
+
+def _local_name(tag):
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit("}", 1)[-1]
@@ -7,13 +7,116 @@ This module provides a dialog interface that allows users to:
 3. Confirm or cancel the mapping operation
 
 The dialog uses fuzzy matching to suggest potential column matches when exact matches aren't found.
+Headers are read and matched on a background thread so the dialog stays responsive.
 """
 
+import functools
+
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
                             QTreeWidget, QTreeWidgetItem, QHeaderView,
-                             QComboBox)
-import pandas as pd
-from fuzzywuzzy import process  # Library for fuzzy string matching
+                             QComboBox, QProgressBar, QMessageBox)
+from PyQt6.QtCore import QThread, QStringListModel, pyqtSignal
+import numpy as np
+from rapidfuzz import fuzz, process, utils  # Library for fuzzy string matching
+
+from header_reader import read_headers
+
+#----------------------------------------------------
+# Background Mapping Loader
+#----------------------------------------------------
+class MappingLoader(QThread):
+    """
+    A worker thread that reads the column headers of both Excel files and
+    computes fuzzy matching suggestions without blocking the GUI thread.
+    """
+    # Emits (target_columns, source_columns, suggestions_by_column)
+    loaded = pyqtSignal(object)
+    # Emits the error message if the headers could not be read
+    failed = pyqtSignal(str)
+
+    def __init__(self, source_file, target_file, parent=None):
+        """
+        Initialize the loader.
+        
+        Args:
+            source_file: Path to the source Excel file
+            target_file: Path to the target Excel file
+            parent: Optional parent QObject
+        """
+        super().__init__(parent)
+        self.source_file = source_file
+        self.target_file = target_file
+
+    def run(self):
+        """Read both header rows, score them and emit the result."""
+        try:
+            # Read only headers (no data) from both files; append_data reuses the cached result
+            source_columns = read_headers(self.source_file)
+            target_columns = read_headers(self.target_file)
+            suggestions_by_column = suggest_mappings(target_columns, source_columns)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.loaded.emit((target_columns, source_columns, suggestions_by_column))
+
+def suggest_mappings(target_columns, source_columns):
+    """
+    Suggest source columns for each target column that has no exact match.
+    Results are cached per pair of header lists, so reopening the dialog for
+    the same files skips the fuzzy matching.
+    
+    Args:
+        target_columns: List of target column names
+        source_columns: List of source column names
+    
+    Returns:
+        dict: {target_column: [suggested source columns]}, best match first
+    """
+    return {
+        target_col: list(suggestions)
+        for target_col, suggestions in _suggest_mappings_cached(tuple(target_columns), tuple(source_columns))
+    }
+
+@functools.lru_cache(maxsize=16)
+def _suggest_mappings_cached(target_columns, source_columns):
+    """
+    Score the header tuples and return ((target_column, (suggestions, ...)), ...).
+    
+    The headers are keyed in their given order, since source column order
+    decides which suggestion comes first when scores tie.
+    """
+    # Score every unmatched target column against every source column in one call
+    # (min 60% similarity, keeping the top 5 per target column)
+    source_set = set(source_columns)
+    unmatched_columns = [col for col in target_columns if col not in source_set]
+    scores = process.cdist(unmatched_columns, source_columns, scorer=fuzz.WRatio,
+                           processor=utils.default_process, score_cutoff=60)
+    suggestions = []
+    for row, target_col in enumerate(unmatched_columns):
+        best = np.argsort(-scores[row], kind="stable")[:5]
+        suggestions.append((target_col, tuple(source_columns[i] for i in best if scores[row, i] >= 60)))
+    return tuple(suggestions)
+
+#----------------------------------------------------
+# Suggestion Dropdown
+#----------------------------------------------------
+class SuggestionComboBox(QComboBox):
+    """
+    A dropdown of suggested source columns for one row of the mapping tree.
+    It remembers its tree item so a single slot can serve every dropdown.
+    """
+    def __init__(self, tree_item, suggestions):
+        """
+        Initialize the dropdown with a placeholder followed by the suggestions.
+        
+        Args:
+            tree_item: The QTreeWidgetItem this dropdown belongs to
+            suggestions: List of suggested source column names
+        """
+        super().__init__()
+        self.tree_item = tree_item
+        # Populate in one go from a list model (parented so it lives as long as the combo)
+        self.setModel(QStringListModel(["Select mapping..."] + suggestions, self))
 
 #----------------------------------------------------
 # Mapping Review Dialog
@@ -54,15 +157,24 @@ class MappingReviewDialog(QDialog):
         self.mapping_tree.header().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         layout.addWidget(self.mapping_tree)
 
+        # Busy indicator shown while the mappings load in the background
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setFormat("Loading column mappings...")
+        self.progress_bar.setTextVisible(True)
+        layout.addWidget(self.progress_bar)
+
         #----------------------------------------------------
         # Button Section
         #----------------------------------------------------
         button_layout = QHBoxLayout()
         
         # Proceed button - confirms mappings and closes dialog with accept result
-        proceed_button = QPushButton("Proceed")
-        proceed_button.clicked.connect(self.accept)
-        button_layout.addWidget(proceed_button)
+        # (disabled until the mappings have loaded)
+        self.proceed_button = QPushButton("Proceed")
+        self.proceed_button.setEnabled(False)
+        self.proceed_button.clicked.connect(self.accept)
+        button_layout.addWidget(self.proceed_button)
         
         # Cancel button - closes dialog with reject result
         cancel_button = QPushButton("Cancel")
@@ -76,17 +188,30 @@ class MappingReviewDialog(QDialog):
 
     def load_mappings(self):
         """
-        Load column headers from both Excel files and create initial mappings.
+        Start loading column headers from both Excel files on a background thread.
+        The tree is filled in by populate_mappings once the loader finishes.
+        """
+        self.loader = MappingLoader(self.source_file, self.target_file, self)
+        self.loader.loaded.connect(self.populate_mappings)
+        self.loader.failed.connect(self.on_load_failed)
+        self.loader.start()
+
+    def populate_mappings(self, result):
+        """
+        Create initial mappings from the loaded headers and suggestions.
         Creates a tree widget entry for each target column with:
         - Automatic mapping if column names match exactly
         - Suggested mappings based on fuzzy string matching for non-matching columns
+        
+        Args:
+            result: Tuple of (target_columns, source_columns, suggestions_by_column)
         """
-        # Read only headers (no data) from both files for efficiency
-        source_df = pd.read_excel(self.source_file, nrows=0)
-        target_df = pd.read_excel(self.target_file, nrows=0)
-
-        source_columns = source_df.columns
-        target_columns = target_df.columns
+        target_columns, source_columns, suggestions_by_column = result
+        source_set = set(source_columns)
+        self.progress_bar.hide()
+        self.proceed_button.setEnabled(True)
+        # Repaint once after all rows are added rather than after each one
+        self.mapping_tree.setUpdatesEnabled(False)
 
         # For each target column, try to find a matching source column
         for target_col in target_columns:
@@ -95,38 +220,49 @@ class MappingReviewDialog(QDialog):
             item.setText(0, target_col)  # Set target column name
             
             # If exact match found, use it as the default mapping
-            if target_col in source_columns:
+            if target_col in source_set:
                 item.setText(1, target_col)
                 self.manual_mappings[target_col] = target_col
             else:
                 # No exact match, mark as not mapped and provide suggestions
                 item.setText(1, "Not Mapped")
                 
-                # Use fuzzy matching to find potential matches (min 60% similarity)
-                matches = process.extract(target_col, source_columns, limit=5)
-                suggestions = [match[0] for match in matches if match[1] >= 60]
-                
-                # Create dropdown with suggestions
-                combo = QComboBox()
-                combo.addItem("Select mapping...")
-                combo.addItems(suggestions)
+                # Create dropdown with the fuzzy matching suggestions
+                combo = SuggestionComboBox(item, suggestions_by_column[target_col])
                 # Connect change event to update mapping when user selects an option
-                combo.currentIndexChanged.connect(lambda index, item=item, combo=combo: 
-                                                 self.on_mapping_selected(item, combo))
+                combo.currentIndexChanged.connect(self.on_mapping_selected)
                 
                 # Add the dropdown to the tree widget in the suggestions column
                 self.mapping_tree.setItemWidget(item, 2, combo)
 
-    def on_mapping_selected(self, item, combo):
+        self.mapping_tree.setUpdatesEnabled(True)
+
+    def on_load_failed(self, message):
+        """
+        Report a failure to read the Excel files and close the dialog.
+        
+        Args:
+            message: The error message from the loader
+        """
+        QMessageBox.critical(self, "Error", f"An error occurred while reading the files: {message}")
+        self.reject()
+
+    def done(self, result):
+        """Wait for the loader thread to finish before the dialog closes."""
+        self.loader.wait()
+        super().done(result)
+
+    def on_mapping_selected(self, index):
         """
-        Update mapping when user selects an option from the dropdown.
+        Update mapping when user selects an option from one of the dropdowns.
         
         Args:
-            item: The QTreeWidgetItem representing the row
-            combo: The QComboBox with the selection
+            index: The index selected in the SuggestionComboBox that sent the signal
         """
+        combo = self.sender()
+        item = combo.tree_item
         # Only update if user actually selects a mapping (not the placeholder)
-        if combo.currentIndex() > 0:
+        if index > 0:
             target_col = item.text(0)
             source_col = combo.currentText()
             